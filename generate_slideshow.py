@@ -4,12 +4,92 @@
 扫描目录中的PNG图片和视频，生成可点击翻页的HTML播放器
 """
 
+import io
 import os
 import re
+import sys
+import stat
+import gzip
 import json
 import argparse
-from pathlib import Path
-from typing import List, Dict, Optional
+from concurrent.futures import ThreadPoolExecutor
+from itertools import islice
+from string import Template
+from typing import List, Dict, Optional, Tuple, Union
+
+try:
+    import orjson
+except ImportError:  # 可选依赖，未安装时退回标准库json
+    orjson = None
+
+
+def _dumps(obj) -> str:
+    """序列化为JSON字符串 (保留非ASCII字符)，优先使用orjson"""
+    if orjson is not None:
+        return orjson.dumps(obj).decode('utf-8')
+    return json.dumps(obj, ensure_ascii=False)
+
+
+# 目录项文件名 (分组: N.png / N.mp4 / N-M.mp4 过渡视频 / 封面.mp4)
+_ENTRY_RE = re.compile(r'^(?:(\d+)\.png|(\d+)\.mp4|(\d+)-(\d+)\.mp4|封面\.mp4)$')
+
+
+# 视频键: 单页视频为页码，过渡视频为 (起始页, 目标页)
+VideoKey = Union[int, Tuple[int, int]]
+
+# 目录项超过该数量时才启用线程池分类
+_PARALLEL_SCAN_THRESHOLD = 256
+_SCAN_WORKERS = 4
+
+
+def _classify(entry: os.DirEntry) -> Optional[Tuple[str, VideoKey, str]]:
+    """
+    对单个目录项分类
+
+    只用DirEntry和字符串操作，不构造Path对象；正则只匹配目录下的文件名，
+    因此文件名本身就是相对路径
+
+    Returns:
+        ('png', 页码, 文件名) / ('mp4' | 'trans' | 'cover', 视频键, 文件名)，
+        视频键为页码int或过渡视频的 (起始页, 目标页) 元组；无关文件返回None
+    """
+    name = entry.name
+    # 先用首字符和后缀快速排除无关文件 (.DS_Store 等)，再跑正则
+    if not name[:1].isdigit() and name != "封面.mp4":
+        return None
+    if not name.endswith(('.png', '.mp4')):
+        return None
+
+    match = _ENTRY_RE.match(name)
+    if not match or not entry.is_file():
+        return None
+
+    png_num, mp4_num, trans_from, trans_to = match.groups()
+
+    if png_num is not None:
+        return ('png', int(png_num), name)
+    if mp4_num is not None:
+        return ('mp4', int(mp4_num), name)
+    if trans_from is not None:
+        return ('trans', (int(trans_from), int(trans_to)), name)
+    return ('cover', 1, name)
+
+
+def _classify_entries(entries: List[os.DirEntry]) -> List[Tuple[str, VideoKey, str]]:
+    """依次分类一组目录项，丢弃无关文件"""
+    results = []
+    for entry in entries:
+        result = _classify(entry)
+        if result is not None:
+            results.append(result)
+    return results
+
+
+def _video_key(key: VideoKey) -> str:
+    """视频键转为播放器使用的字符串键 ("N" 或 "N-M")"""
+    if isinstance(key, int):
+        return str(key)
+    return f"{key[0]}-{key[1]}"
 
 
 def scan_slides(directory: str) -> Dict:
@@ -20,53 +100,37 @@ def scan_slides(directory: str) -> Dict:
         directory: 目录路径
 
     Returns:
-        包含slides和videos信息的字典
+        包含slides和videos信息的字典，slides为按页码排序的 (页码, 文件名) 元组列表，
+        videos以页码int或 (起始页, 目标页) 元组为键
     """
-    dir_path = Path(directory)
-
-    # 扫描PNG图片 (数字命名: 1.png, 2.png, ...)
-    png_pattern = re.compile(r'^(\d+)\.png$')
+    # 一次性读出目录项，再逐项分类
+    with os.scandir(directory) as it:
+        entries = list(it)
+
+    if len(entries) > _PARALLEL_SCAN_THRESHOLD:
+        # 大目录 (如网络存储) 用线程池分块分类，与 is_file() 的I/O重叠
+        size = -(-len(entries) // _SCAN_WORKERS)
+        chunks = [entries[i:i + size] for i in range(0, len(entries), size)]
+        with ThreadPoolExecutor(max_workers=_SCAN_WORKERS) as ex:
+            results = [r for chunk in ex.map(_classify_entries, chunks) for r in chunk]
+    else:
+        results = _classify_entries(entries)
+
+    # 按目录顺序在主线程汇总
     slides = []
-
-    for f in dir_path.iterdir():
-        if f.is_file():
-            match = png_pattern.match(f.name)
-            if match:
-                num = int(match.group(1))
-                slides.append({
-                    'num': num,
-                    'filename': f.name,
-                    'path': str(f.relative_to(dir_path))
-                })
-
-    # 按数字排序
-    slides.sort(key=lambda x: x['num'])
-
-    # 扫描视频文件
-    videos = {}
-
-    # 检查封面视频 (对应第1页)
-    cover_video = dir_path / "封面.mp4"
-    if cover_video.exists():
-        videos['1'] = "封面.mp4"
-
-    # 检查其他可能的视频 (格式: N.mp4 或 N-M.mp4 过渡视频)
-    mp4_pattern = re.compile(r'^(\d+)\.mp4$')
-    transition_pattern = re.compile(r'^(\d+)-(\d+)\.mp4$')
-
-    for f in dir_path.iterdir():
-        if f.is_file() and f.suffix.lower() == '.mp4':
-            # 单页视频
-            match = mp4_pattern.match(f.name)
-            if match:
-                num = match.group(1)
-                videos[num] = f.name
-
-            # 过渡视频
-            match = transition_pattern.match(f.name)
-            if match:
-                key = f"{match.group(1)}-{match.group(2)}"
-                videos[key] = f.name
+    videos: Dict[VideoKey, str] = {}
+    for kind, key, name in results:
+        if kind == 'png':
+            slides.append((key, name))
+        elif kind == 'cover':
+            # 封面视频 (对应第1页，1.mp4 优先)
+            videos.setdefault(key, name)
+        else:
+            # 单页视频 / 过渡视频
+            videos[key] = name
+
+    # 按数字排序 (元组直接比较，无需key函数；页码相同时按文件名)
+    slides.sort()
 
     return {
         'slides': slides,
@@ -75,74 +139,66 @@ def scan_slides(directory: str) -> Dict:
     }
 
 
-def generate_html(data: Dict, output_path: str, title: str = "幻灯片播放器"):
-    """
-    生成HTML播放器
-
-    Args:
-        data: 扫描得到的数据
-        output_path: 输出HTML文件路径
-        title: 页面标题
-    """
-    slides_json = json.dumps([s['path'] for s in data['slides']], ensure_ascii=False)
-    videos_json = json.dumps(data['videos'], ensure_ascii=False)
-
-    html_content = f'''<!DOCTYPE html>
+# HTML播放器模板源码 (string.Template: $占位符，JS模板字符串中的 $ 写作 $$)
+# @video-begin / @video-end 标记之间是仅在有视频时才需要的CSS/JS
+_HTML_SOURCE = '''<!DOCTYPE html>
 <html lang="zh-CN">
 <head>
     <meta charset="UTF-8">
     <meta name="viewport" content="width=device-width, initial-scale=1.0">
-    <title>{title}</title>
+    <title>$title</title>
     <style>
-        * {{
+        * {
             margin: 0;
             padding: 0;
             box-sizing: border-box;
-        }}
+        }
 
-        body {{
+        body {
             overflow: hidden;
             background: #1a1a2e;
             font-family: -apple-system, BlinkMacSystemFont, "Segoe UI", Roboto, "Helvetica Neue", Arial, sans-serif;
-        }}
+        }
 
-        .container {{
+        .container {
             width: 100vw;
             height: 100vh;
             display: flex;
             justify-content: center;
             align-items: center;
             position: relative;
-        }}
+        }
 
         /* 幻灯片图片 */
-        .slide-image {{
+        .slide-image {
             max-width: 100%;
             max-height: 100%;
             object-fit: contain;
             display: none;
             cursor: pointer;
-        }}
+        }
 
-        .slide-image.active {{
+        .slide-image.active {
             display: block;
-        }}
+        }
 
+        /* @video-begin */
         /* 视频播放器 - 全屏拉伸 */
-        .video-player {{
+        .video-player {
             width: 100%;
             height: 100%;
             object-fit: fill;
             display: none;
             cursor: pointer;
-        }}
+        }
 
-        .video-player.active {{
+        .video-player.active {
             display: block;
-        }}
+        }
+        /* @video-end */
 
         /* 页码指示器 */
-        .indicator {{
+        .indicator {
             position: fixed;
             top: 20px;
             right: 20px;
@@ -155,10 +211,10 @@ def generate_html(data: Dict, output_path: str, title: str = "幻灯片播放器
             z-index: 100;
             backdrop-filter: blur(10px);
             user-select: none;
-        }}
+        }
 
         /* 导航按钮 */
-        .nav-btn {{
+        .nav-btn {
             position: fixed;
             top: 50%;
             transform: translateY(-50%);
@@ -172,31 +228,31 @@ def generate_html(data: Dict, output_path: str, title: str = "幻灯片播放器
             transition: all 0.3s;
             opacity: 0;
             border-radius: 8px;
-        }}
+        }
 
-        .nav-btn:hover {{
+        .nav-btn:hover {
             background: rgba(0, 0, 0, 0.8);
-        }}
+        }
 
-        .container:hover .nav-btn {{
+        .container:hover .nav-btn {
             opacity: 1;
-        }}
+        }
 
-        .nav-btn.prev {{
+        .nav-btn.prev {
             left: 20px;
-        }}
+        }
 
-        .nav-btn.next {{
+        .nav-btn.next {
             right: 20px;
-        }}
+        }
 
-        .nav-btn:disabled {{
+        .nav-btn:disabled {
             opacity: 0.3;
             cursor: not-allowed;
-        }}
+        }
 
         /* 控制提示 */
-        .controls {{
+        .controls {
             position: fixed;
             bottom: 20px;
             left: 50%;
@@ -211,20 +267,20 @@ def generate_html(data: Dict, output_path: str, title: str = "幻灯片播放器
             opacity: 1;
             transition: opacity 0.3s;
             user-select: none;
-        }}
+        }
 
-        .controls.hidden {{
+        .controls.hidden {
             opacity: 0;
             pointer-events: none;
-        }}
+        }
 
-        .controls span {{
+        .controls span {
             margin: 0 10px;
             color: #888;
-        }}
+        }
 
         /* 进度条 */
-        .progress-bar {{
+        .progress-bar {
             position: fixed;
             bottom: 0;
             left: 0;
@@ -232,10 +288,10 @@ def generate_html(data: Dict, output_path: str, title: str = "幻灯片播放器
             background: linear-gradient(90deg, #667eea 0%, #764ba2 100%);
             transition: width 0.3s;
             z-index: 100;
-        }}
+        }
 
         /* 缩略图导航 */
-        .thumbnail-nav {{
+        .thumbnail-nav {
             position: fixed;
             bottom: 70px;
             left: 50%;
@@ -248,13 +304,13 @@ def generate_html(data: Dict, output_path: str, title: str = "幻灯片播放器
             max-width: 90vw;
             overflow-x: auto;
             z-index: 100;
-        }}
+        }
 
-        .thumbnail-nav.visible {{
+        .thumbnail-nav.visible {
             display: flex;
-        }}
+        }
 
-        .thumbnail {{
+        .thumbnail {
             width: 80px;
             height: 45px;
             object-fit: cover;
@@ -263,29 +319,29 @@ def generate_html(data: Dict, output_path: str, title: str = "幻灯片播放器
             border-radius: 4px;
             opacity: 0.6;
             transition: all 0.2s;
-        }}
+        }
 
-        .thumbnail:hover {{
+        .thumbnail:hover {
             opacity: 1;
-        }}
+        }
 
-        .thumbnail.active {{
+        .thumbnail.active {
             border-color: #667eea;
             opacity: 1;
-        }}
+        }
 
         /* 视频图标标记 */
-        .has-video::after {{
+        .has-video::after {
             content: "▶";
             position: absolute;
             bottom: 2px;
             right: 2px;
             font-size: 10px;
             color: #667eea;
-        }}
+        }
 
         /* 加载指示 */
-        .loading {{
+        .loading {
             position: fixed;
             top: 50%;
             left: 50%;
@@ -294,13 +350,13 @@ def generate_html(data: Dict, output_path: str, title: str = "幻灯片播放器
             font-size: 18px;
             z-index: 200;
             display: none;
-        }}
+        }
 
-        .loading.active {{
+        .loading.active {
             display: block;
-        }}
+        }
 
-        .loading::after {{
+        .loading::after {
             content: '';
             display: inline-block;
             width: 20px;
@@ -310,11 +366,11 @@ def generate_html(data: Dict, output_path: str, title: str = "幻灯片播放器
             border-radius: 50%;
             border-top-color: transparent;
             animation: spin 1s linear infinite;
-        }}
+        }
 
-        @keyframes spin {{
-            to {{ transform: rotate(360deg); }}
-        }}
+        @keyframes spin {
+            to { transform: rotate(360deg); }
+        }
     </style>
 </head>
 <body>
@@ -326,7 +382,7 @@ def generate_html(data: Dict, output_path: str, title: str = "幻灯片播放器
     <button class="nav-btn next" id="nextBtn">&#10095;</button>
 
     <div class="indicator">
-        <span id="current">1</span> / <span id="total">{data['total']}</span>
+        <span id="current">1</span> / <span id="total">$total</span>
     </div>
 
 
@@ -340,15 +396,21 @@ def generate_html(data: Dict, output_path: str, title: str = "幻灯片播放器
 
     <script>
         // 数据
-        const slidesData = {slides_json};
-        const videosData = {videos_json};
-
-        class SlideShowPlayer {{
-            constructor() {{
+        const slidesData = $slides_json;
+        // DOM中保留的前后图片数量
+        const IMAGE_WINDOW = 1;
+        // @video-begin
+        const videosData = $videos_json;
+        // @video-end
+
+        class SlideShowPlayer {
+            constructor() {
                 this.slides = slidesData;
+                // @video-begin
                 this.videos = videosData;
-                this.currentSlide = 0;
                 this.isVideoPlaying = false;
+                // @video-end
+                this.currentSlide = 0;
                 this.showThumbnails = false;
 
                 this.container = document.getElementById('container');
@@ -360,24 +422,19 @@ def generate_html(data: Dict, output_path: str, title: str = "幻灯片播放器
                 this.prevBtn = document.getElementById('prevBtn');
                 this.nextBtn = document.getElementById('nextBtn');
 
+                // @video-begin
                 this.videoElement = null;
-                this.imageElements = [];
+                // @video-end
+                // 页码 -> 图片元素，只保留当前页附近的窗口
+                this.imageElements = new Map();
 
                 this.init();
-            }}
+            }
 
-            init() {{
-                // 创建图片元素
-                this.slides.forEach((slidePath, index) => {{
-                    const img = document.createElement('img');
-                    img.src = slidePath;
-                    img.className = 'slide-image';
-                    img.alt = `幻灯片 ${{index + 1}}`;
-                    img.addEventListener('click', () => this.onSlideClick());
-                    this.container.appendChild(img);
-                    this.imageElements.push(img);
-                }});
+            init() {
+                // 图片元素在 showSlide 中按需创建
 
+                // @video-begin
                 // 创建视频元素
                 this.videoElement = document.createElement('video');
                 this.videoElement.className = 'video-player';
@@ -385,6 +442,7 @@ def generate_html(data: Dict, output_path: str, title: str = "幻灯片播放器
                 this.videoElement.addEventListener('click', () => this.toggleVideo());
                 this.videoElement.addEventListener('ended', () => this.onVideoEnded());
                 this.container.appendChild(this.videoElement);
+                // @video-end
 
                 // 创建缩略图
                 this.createThumbnails();
@@ -398,22 +456,24 @@ def generate_html(data: Dict, output_path: str, title: str = "幻灯片播放器
                 // 显示第一页
                 this.showSlide(0);
 
-            }}
+            }
 
-            createThumbnails() {{
-                this.slides.forEach((slidePath, index) => {{
+            createThumbnails() {
+                this.slides.forEach((slidePath, index) => {
                     const thumb = document.createElement('img');
+                    // 缩略图栏默认隐藏，延迟加载避免一开始就请求全部图片 (需在设置src之前)
+                    thumb.loading = 'lazy';
                     thumb.src = slidePath;
                     thumb.className = 'thumbnail';
-                    thumb.addEventListener('click', () => this.goToSlide(index));
+                    thumb.dataset.index = index;
                     this.thumbnailsEl.appendChild(thumb);
-                }});
-            }}
+                });
+            }
 
-            bindEvents() {{
+            bindEvents() {
                 // 键盘控制
-                document.addEventListener('keydown', (e) => {{
-                    switch(e.key) {{
+                document.addEventListener('keydown', (e) => {
+                    switch(e.key) {
                         case 'ArrowLeft':
                         case 'ArrowUp':
                         case 'PageUp':
@@ -447,12 +507,24 @@ def generate_html(data: Dict, output_path: str, title: str = "幻灯片播放器
                             this.toggleThumbnails();
                             break;
                         case 'Escape':
-                            if (this.showThumbnails) {{
+                            if (this.showThumbnails) {
                                 this.toggleThumbnails();
-                            }}
+                            }
                             break;
-                    }}
-                }});
+                    }
+                });
+
+                // 点击图片 / 缩略图 (事件委托，只在容器上绑定一次)
+                this.container.addEventListener('click', (e) => {
+                    if (e.target.classList.contains('slide-image')) {
+                        this.onSlideClick();
+                    }
+                });
+                this.thumbnailsEl.addEventListener('click', (e) => {
+                    if (e.target.classList.contains('thumbnail')) {
+                        this.goToSlide(Number(e.target.dataset.index));
+                    }
+                });
 
                 // 导航按钮
                 this.prevBtn.addEventListener('click', () => this.previousSlide());
@@ -460,42 +532,75 @@ def generate_html(data: Dict, output_path: str, title: str = "幻灯片播放器
 
                 // 触摸滑动支持
                 let touchStartX = 0;
-                this.container.addEventListener('touchstart', (e) => {{
+                this.container.addEventListener('touchstart', (e) => {
                     touchStartX = e.touches[0].clientX;
-                }});
+                });
 
-                this.container.addEventListener('touchend', (e) => {{
+                this.container.addEventListener('touchend', (e) => {
                     const touchEndX = e.changedTouches[0].clientX;
                     const diff = touchStartX - touchEndX;
-                    if (Math.abs(diff) > 50) {{
-                        if (diff > 0) {{
+                    if (Math.abs(diff) > 50) {
+                        if (diff > 0) {
                             this.nextSlide();
-                        }} else {{
+                        } else {
                             this.previousSlide();
-                        }}
-                    }}
-                }});
-            }}
-
-            showSlide(index) {{
+                        }
+                    }
+                });
+            }
+
+            ensureImage(index) {
+                let img = this.imageElements.get(index);
+                if (!img) {
+                    img = document.createElement('img');
+                    img.src = this.slides[index];
+                    img.className = 'slide-image';
+                    img.alt = `幻灯片 $${index + 1}`;
+                    this.container.appendChild(img);
+                    this.imageElements.set(index, img);
+                }
+                return img;
+            }
+
+            updateImageWindow(index) {
+                // 移除窗口外的图片元素
+                this.imageElements.forEach((img, i) => {
+                    if (Math.abs(i - index) > IMAGE_WINDOW) {
+                        img.remove();
+                        this.imageElements.delete(i);
+                    }
+                });
+
+                // 创建当前页及前后页 (预加载)
+                const first = Math.max(0, index - IMAGE_WINDOW);
+                const last = Math.min(this.slides.length - 1, index + IMAGE_WINDOW);
+                for (let i = first; i <= last; i++) {
+                    this.ensureImage(i);
+                }
+            }
+
+            showSlide(index) {
                 if (index < 0 || index >= this.slides.length) return;
 
                 this.currentSlide = index;
-                this.isVideoPlaying = false;
 
                 // 隐藏所有
                 this.imageElements.forEach(img => img.classList.remove('active'));
+                // @video-begin
+                this.isVideoPlaying = false;
                 this.videoElement.classList.remove('active');
                 this.videoElement.pause();
+                // @video-end
 
                 // 显示当前图片
-                this.imageElements[index].classList.add('active');
+                this.updateImageWindow(index);
+                this.imageElements.get(index).classList.add('active');
 
                 // 更新UI
                 this.updateUI();
-            }}
+            }
 
-            updateUI() {{
+            updateUI() {
                 // 更新页码
                 this.currentIndicator.textContent = this.currentSlide + 1;
 
@@ -509,121 +614,178 @@ def generate_html(data: Dict, output_path: str, title: str = "幻灯片播放器
 
                 // 更新缩略图
                 const thumbs = this.thumbnailsEl.querySelectorAll('.thumbnail');
-                thumbs.forEach((thumb, i) => {{
+                thumbs.forEach((thumb, i) => {
                     thumb.classList.toggle('active', i === this.currentSlide);
-                }});
-            }}
+                });
+            }
 
-            onSlideClick() {{
+            onSlideClick() {
+                // @video-begin
                 const slideNum = (this.currentSlide + 1).toString();
 
-                if (this.isVideoPlaying) {{
+                if (this.isVideoPlaying) {
                     // 正在播放视频，点击暂停/播放
                     this.toggleVideo();
-                }} else if (this.videos[slideNum]) {{
+                    return;
+                }
+                if (this.videos[slideNum]) {
                     // 有视频，播放视频
                     this.playVideo(this.videos[slideNum]);
-                }} else {{
-                    // 没有视频，下一页
-                    this.nextSlide();
-                }}
-            }}
+                    return;
+                }
 
-            playVideo(videoPath) {{
+                // @video-end
+                // 没有视频，下一页
+                this.nextSlide();
+            }
+
+            // @video-begin
+            playVideo(videoPath) {
                 this.loadingEl.classList.add('active');
 
-                this.imageElements[this.currentSlide].classList.remove('active');
+                this.imageElements.get(this.currentSlide).classList.remove('active');
                 this.videoElement.src = videoPath;
                 this.videoElement.classList.add('active');
 
                 // 第1页（封面）循环播放
                 this.videoElement.loop = (this.currentSlide === 0);
 
-                this.videoElement.onloadeddata = () => {{
+                this.videoElement.onloadeddata = () => {
                     this.loadingEl.classList.remove('active');
                     this.videoElement.play();
                     this.isVideoPlaying = true;
-                }};
+                };
 
-                this.videoElement.onerror = () => {{
+                this.videoElement.onerror = () => {
                     this.loadingEl.classList.remove('active');
                     this.showSlide(this.currentSlide);
-                }};
-            }}
+                };
+            }
 
-            toggleVideo() {{
-                if (this.videoElement.paused) {{
+            toggleVideo() {
+                if (this.videoElement.paused) {
                     this.videoElement.play();
-                }} else {{
+                } else {
                     this.videoElement.pause();
-                }}
-            }}
+                }
+            }
 
-            onVideoEnded() {{
+            onVideoEnded() {
                 this.isVideoPlaying = false;
                 // 视频播放完，显示当前页图片
                 this.showSlide(this.currentSlide);
-            }}
+            }
 
-            nextSlide() {{
-                if (this.isVideoPlaying) {{
+            // @video-end
+            nextSlide() {
+                // @video-begin
+                if (this.isVideoPlaying) {
                     // 跳过视频
                     this.videoElement.pause();
                     this.isVideoPlaying = false;
-                }}
+                }
 
-                if (this.currentSlide < this.slides.length - 1) {{
+                // @video-end
+                if (this.currentSlide < this.slides.length - 1) {
                     this.showSlide(this.currentSlide + 1);
-                }}
-            }}
+                }
+            }
 
-            previousSlide() {{
-                if (this.isVideoPlaying) {{
+            previousSlide() {
+                // @video-begin
+                if (this.isVideoPlaying) {
                     this.videoElement.pause();
                     this.isVideoPlaying = false;
-                }}
+                }
 
-                if (this.currentSlide > 0) {{
+                // @video-end
+                if (this.currentSlide > 0) {
                     this.showSlide(this.currentSlide - 1);
-                }}
-            }}
+                }
+            }
 
-            goToSlide(index) {{
-                if (this.isVideoPlaying) {{
+            goToSlide(index) {
+                // @video-begin
+                if (this.isVideoPlaying) {
                     this.videoElement.pause();
                     this.isVideoPlaying = false;
-                }}
+                }
+                // @video-end
                 this.showSlide(index);
-            }}
+            }
 
-            toggleFullscreen() {{
-                if (!document.fullscreenElement) {{
+            toggleFullscreen() {
+                if (!document.fullscreenElement) {
                     document.documentElement.requestFullscreen();
-                }} else {{
+                } else {
                     document.exitFullscreen();
-                }}
-            }}
+                }
+            }
 
-            toggleThumbnails() {{
+            toggleThumbnails() {
                 this.showThumbnails = !this.showThumbnails;
                 this.thumbnailsEl.classList.toggle('visible', this.showThumbnails);
-            }}
-        }}
+            }
+        }
 
         // 启动播放器
-        window.addEventListener('DOMContentLoaded', () => {{
+        window.addEventListener('DOMContentLoaded', () => {
             new SlideShowPlayer();
-        }});
+        });
     </script>
 </body>
 </html>
 '''
 
-    with open(output_path, 'w', encoding='utf-8') as f:
-        f.write(html_content)
+_VIDEO_BLOCK_RE = re.compile(
+    r'^[ \t]*(?://|/\*) @video-begin.*?^[ \t]*(?://|/\*) @video-end.*?\n',
+    re.M | re.S
+)
+_VIDEO_MARKER_RE = re.compile(r'^[ \t]*(?://|/\*) @video-(?:begin|end).*\n', re.M)
+
+# 有视频: 只去掉标记行；无视频: 整段去掉视频相关代码
+_HTML_TEMPLATE = Template(_VIDEO_MARKER_RE.sub('', _HTML_SOURCE))
+_HTML_TEMPLATE_NO_VIDEO = Template(_VIDEO_BLOCK_RE.sub('', _HTML_SOURCE))
+
+
+def generate_html(data: Dict, output_path: str, title: str = "幻灯片播放器",
+                  compress: bool = False):
+    """
+    生成HTML播放器
+
+    Args:
+        data: 扫描得到的数据
+        output_path: 输出HTML文件路径
+        title: 页面标题
+        compress: 是否同时生成gzip压缩的 output_path.gz (供静态服务器直接发送)
+    """
+    fields = {
+        'title': title,
+        'total': data['total'],
+        'slides_json': _dumps([name for _, name in data['slides']]),
+    }
+
+    # 没有视频时使用精简模板，省去视频播放相关代码
+    if data['videos']:
+        fields['videos_json'] = _dumps({_video_key(k): v for k, v in data['videos'].items()})
+        html_content = _HTML_TEMPLATE.substitute(fields)
+    else:
+        html_content = _HTML_TEMPLATE_NO_VIDEO.substitute(fields)
+
+    html_bytes = html_content.encode('utf-8')
+    with open(output_path, 'wb') as f:
+        f.write(html_bytes)
 
     print(f"✅ HTML播放器已生成: {output_path}")
 
+    if compress:
+        # mtime=0 使内容相同时压缩文件也保持一致
+        gz_path = output_path + '.gz'
+        with open(gz_path, 'wb') as f:
+            f.write(gzip.compress(html_bytes, compresslevel=9, mtime=0))
+
+        print(f"✅ 压缩版本已生成: {gz_path}")
+
 
 def main():
     parser = argparse.ArgumentParser(
@@ -640,6 +802,9 @@ def main():
   # 指定输出文件名和标题
   python generate_slideshow.py --output presentation.html --title "我的报告"
 
+  # 同时生成gzip压缩版本 (slideshow.html.gz)
+  python generate_slideshow.py --gzip
+
 支持的文件格式:
   - 图片: 1.png, 2.png, 3.png, ... (数字命名)
   - 视频: 封面.mp4 (对应1.png), 或 N.mp4 (对应N.png)
@@ -672,15 +837,28 @@ def main():
         help='页面标题'
     )
 
+    parser.add_argument(
+        '--gzip', '-z',
+        action='store_true',
+        help='同时生成gzip压缩的HTML文件 (输出文件名.gz)'
+    )
+
     args = parser.parse_args()
 
     # 扫描目录
     directory = os.path.abspath(args.dir)
-    print(f"📁 扫描目录: {directory}")
+    # 扫描大目录可能较慢，先输出提示
+    print(f"📁 扫描目录: {directory}", flush=True)
 
-    if not os.path.exists(directory):
+    # 一次stat同时检查存在性和类型
+    try:
+        st = os.stat(directory)
+    except OSError:
         print(f"❌ 目录不存在: {directory}")
         return 1
+    if not stat.S_ISDIR(st.st_mode):
+        print(f"❌ 不是目录: {directory}")
+        return 1
 
     data = scan_slides(directory)
 
@@ -688,20 +866,24 @@ def main():
         print("❌ 未找到幻灯片图片 (格式: 1.png, 2.png, ...)")
         return 1
 
-    print(f"✅ 找到 {data['total']} 张幻灯片")
-    for s in data['slides'][:5]:
-        print(f"   - {s['filename']}")
+    # 扫描结果先写入缓冲区，生成HTML前一次性输出
+    buf = io.StringIO()
+    buf.write(f"✅ 找到 {data['total']} 张幻灯片\n")
+    for _, name in islice(data['slides'], 5):
+        buf.write(f"   - {name}\n")
     if data['total'] > 5:
-        print(f"   ... 共 {data['total']} 张")
+        buf.write(f"   ... 共 {data['total']} 张\n")
 
     if data['videos']:
-        print(f"✅ 找到 {len(data['videos'])} 个视频")
+        buf.write(f"✅ 找到 {len(data['videos'])} 个视频\n")
         for key, path in data['videos'].items():
-            print(f"   - 第{key}页: {path}")
+            buf.write(f"   - 第{_video_key(key)}页: {path}\n")
+
+    sys.stdout.write(buf.getvalue())
 
     # 生成HTML
     output_path = os.path.join(directory, args.output)
-    generate_html(data, output_path, args.title)
+    generate_html(data, output_path, args.title, compress=args.gzip)
 
     print(f"\n🎉 完成！用浏览器打开 {output_path} 即可播放")
     return 0